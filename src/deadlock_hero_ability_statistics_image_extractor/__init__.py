@@ -1,5 +1,16 @@
 __version__ = "0.1.0"
 
-from .main import main, DeadlockLauncher, HeroImageExtractor, CrossPlatformController, get_default_game_path
+__all__ = ["main", "DeadlockLauncher", "HeroImageExtractor", "CrossPlatformController", "get_default_game_path"]
 
-__all__ = ["main", "DeadlockLauncher", "HeroImageExtractor", "CrossPlatformController", "get_default_game_path"]
\ No newline at end of file
+
+def __getattr__(name):
+    # main pulls in pyautogui, which needs a display; import it only on use so
+    # the standalone modules (layout, manifest, patch_diff, ...) work headless.
+    if name in __all__:
+        import importlib
+        main_module = importlib.import_module(".main", __name__)
+        # Importing the submodule binds "main" to the module; rebind the exports
+        # so "main" is the entry-point function, as with an eager import.
+        globals().update({export: getattr(main_module, export) for export in __all__})
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
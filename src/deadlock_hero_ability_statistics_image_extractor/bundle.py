@@ -0,0 +1,108 @@
+import hashlib
+import io
+import json
+import tarfile
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from .manifest import ExtractionManifest, image_hash
+from .patch_diff import collect_captures
+
+
+BUNDLE_DIR_NAME = "bundles"
+LATEST_INDEX_NAME = "latest.json"
+
+
+def bundle_dir(output_dir: Path) -> Path:
+    return Path(output_dir) / BUNDLE_DIR_NAME
+
+
+def temp_path_for(path: Path) -> Path:
+    # Unique per writer so concurrent builds never share or truncate a file
+    return path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def write_json_atomic(path: Path, data: dict):
+    tmp_path = temp_path_for(path)
+    tmp_path.write_text(json.dumps(data), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def collect_bundle_files(output_dir: Path) -> dict:
+    # Every capture on disk is bundled; the manifest only supplies the hashes
+    # recorded at capture time, so files it doesn't know are hashed here.
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / "manifest.sqlite"
+    hashes = {}
+    if manifest_path.exists():
+        manifest = ExtractionManifest(manifest_path, read_only=True)
+        try:
+            hashes = {capture["file_path"]: capture["hash"] for capture in manifest.latest_captures()}
+        finally:
+            manifest.close()
+    return {
+        key: (path, hashes.get(key) or image_hash(path))
+        for key, path in collect_captures(output_dir).items()
+    }
+
+
+def build_bundle(output_dir: Path) -> Optional[dict]:
+    """Pack the current crops into one uncompressed tar plus an offset index.
+
+    Members are stored uncompressed, so every PNG is a contiguous byte range of
+    the tar and can be sliced out client-side or fetched with a Range request.
+    The bundle name is derived from the content hashes, which makes it safe to
+    serve with immutable caching headers.
+    """
+    files = collect_bundle_files(output_dir)
+    if not files:
+        return None
+
+    keys = sorted(files)
+    digest = hashlib.sha256("".join(key + files[key][1] for key in keys).encode()).hexdigest()[:16]
+    bundle_name = f"tooltips-{digest}.tar"
+    target_dir = bundle_dir(output_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    bundle_path = target_dir / bundle_name
+    index_path = target_dir / f"tooltips-{digest}.json"
+
+    if index_path.exists() and bundle_path.exists():
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    else:
+        entries = {}
+        tmp_path = temp_path_for(bundle_path)
+        with tarfile.open(tmp_path, "w", format=tarfile.USTAR_FORMAT) as tar:
+            for key in keys:
+                data = files[key][0].read_bytes()
+                info = tarfile.TarInfo(key)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+                # Member data is padded to the block size and directly precedes
+                # the next header, so its start is derived from the new offset.
+                padded = -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+                entries[key] = {"offset": tar.offset - padded, "length": len(data), "hash": files[key][1]}
+        tmp_path.replace(bundle_path)
+
+        index = {
+            "bundle": bundle_name,
+            "size": bundle_path.stat().st_size,
+            "entries": entries,
+        }
+        write_json_atomic(index_path, index)
+
+    write_json_atomic(target_dir / LATEST_INDEX_NAME, index)
+    for stale in target_dir.glob("tooltips-*"):
+        # Temp files may belong to another writer that is still running
+        if stale.suffix == ".tmp" or stale in (bundle_path, index_path):
+            continue
+        stale.unlink(missing_ok=True)
+    return index
+
+
+def load_latest_index(output_dir: Path) -> Optional[dict]:
+    index_path = bundle_dir(output_dir) / LATEST_INDEX_NAME
+    if not index_path.exists():
+        return None
+    return json.loads(index_path.read_text(encoding="utf-8"))
+
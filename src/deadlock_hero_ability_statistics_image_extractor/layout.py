@@ -0,0 +1,152 @@
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# Hover targets as measured on a 1920x1080 screen. The game UI scales with the
+# screen height, and each group is pinned to the screen edge it hugs, so on
+# other aspect ratios the extra width ends up between the groups.
+DEFAULT_PROFILE = {
+    "reference_size": [1920, 1080],
+    "anchors": {
+        "ability_positions": {"edge": "right", "points": [[1417, 983], [1517, 983], [1617, 983], [1717, 983]]},
+        "stat_positions": {"edge": "right", "points": [[1900, 470], [1900, 520], [1900, 560]]},
+        "hero_grid_start": {"edge": "left", "points": [[104, 305]]},
+        "settings_menu_pixel": {"edge": "left", "points": [[162, 917]]},
+        "hero_selection_button": {"edge": "left", "points": [[273, 767]]},
+    },
+    "sizes": {
+        "hero_portrait_size": [75, 125],
+        "hero_gap": 8,
+    },
+}
+
+
+def scale_point(x: float, y: float, edge: str, reference_size: Tuple[int, int],
+                screen_size: Tuple[int, int]) -> Tuple[float, float]:
+    reference_width, reference_height = reference_size
+    width, height = screen_size
+    scale = height / reference_height
+    if edge == "right":
+        sx = width - (reference_width - x) * scale
+    elif edge == "center":
+        sx = width / 2 + (x - reference_width / 2) * scale
+    else:
+        sx = x * scale
+    return (sx, y * scale)
+
+
+def load_profile(path: Optional[Path] = None) -> dict:
+    if path is None:
+        return DEFAULT_PROFILE
+    with open(path, encoding="utf-8") as f:
+        profile = json.load(f)
+
+    # Profiles may override only some anchors or sizes. Overrides are given in
+    # pixels of the profile's own reference size, so they are rescaled into the
+    # default profile's space before being merged with the defaults.
+    default_size = DEFAULT_PROFILE["reference_size"]
+    profile_size = profile.get("reference_size", default_size)
+    scale = default_size[1] / profile_size[1]
+    anchors = {
+        name: {
+            "edge": anchor.get("edge", "left"),
+            "points": [
+                list(scale_point(x, y, anchor.get("edge", "left"), profile_size, default_size))
+                for x, y in anchor["points"]
+            ],
+        }
+        for name, anchor in profile.get("anchors", {}).items()
+    }
+    sizes = {
+        name: [v * scale for v in value] if isinstance(value, list) else value * scale
+        for name, value in profile.get("sizes", {}).items()
+    }
+    return {
+        "reference_size": default_size,
+        "anchors": {**DEFAULT_PROFILE["anchors"], **anchors},
+        "sizes": {**DEFAULT_PROFILE["sizes"], **sizes},
+    }
+
+
+def cluster_positions(values: List[int], tolerance: float) -> List[int]:
+    clusters = []
+    for value in sorted(values):
+        if clusters and value - clusters[-1][-1] <= tolerance:
+            clusters[-1].append(value)
+        else:
+            clusters.append([value])
+    return [int(np.median(cluster)) for cluster in clusters]
+
+
+class ScreenLayout:
+    def __init__(self, screen_size: Tuple[int, int], profile: Optional[dict] = None):
+        self.profile = profile or DEFAULT_PROFILE
+        self.width, self.height = screen_size
+        self.reference_width, self.reference_height = self.profile["reference_size"]
+        self.scale = self.height / self.reference_height
+
+        anchors = self.profile["anchors"]
+        sizes = self.profile["sizes"]
+        self.ability_positions = self.scale_anchor(anchors["ability_positions"])
+        self.stat_positions = self.scale_anchor(anchors["stat_positions"])
+        self.hero_grid_start = self.scale_anchor(anchors["hero_grid_start"])[0]
+        self.settings_menu_pixel = self.scale_anchor(anchors["settings_menu_pixel"])[0]
+        self.hero_selection_button = self.scale_anchor(anchors["hero_selection_button"])[0]
+        portrait_w, portrait_h = sizes["hero_portrait_size"]
+        self.hero_portrait_size = (round(portrait_w * self.scale), round(portrait_h * self.scale))
+        self.hero_gap = max(1, round(sizes["hero_gap"] * self.scale))
+
+    def scale_point(self, x: float, y: float, edge: str = "left") -> Tuple[int, int]:
+        sx, sy = scale_point(x, y, edge, (self.reference_width, self.reference_height), (self.width, self.height))
+        return (round(sx), round(sy))
+
+    def scale_anchor(self, anchor: dict) -> List[Tuple[int, int]]:
+        return [self.scale_point(x, y, anchor.get("edge", "left")) for x, y in anchor["points"]]
+
+    def hero_position(self, hero_index: int, heroes_per_row: int = 7) -> Tuple[int, int]:
+        # Centre of a portrait; the grid start is its left edge and the bottom
+        # edge of the first row.
+        portrait_w, portrait_h = self.hero_portrait_size
+        row = hero_index // heroes_per_row
+        col = hero_index % heroes_per_row
+        x = self.hero_grid_start[0] + col * (portrait_w + self.hero_gap) + portrait_w // 2
+        y = self.hero_grid_start[1] + row * (portrait_h + self.hero_gap) - portrait_h // 2
+        return (x, y)
+
+    def calibrate_hero_grid(self, frame: np.ndarray, heroes_per_row: int = 7) -> bool:
+        # Looks for portrait-sized rectangles in the left half of a hero
+        # selection screenshot and derives the grid origin, size and gap.
+        expected_w, expected_h = self.hero_portrait_size
+        gray = cv2.cvtColor(frame[:, : frame.shape[1] // 2], cv2.COLOR_RGB2GRAY)
+        edges = cv2.Canny(gray, 50, 150)
+        edges = cv2.dilate(edges, np.ones((3, 3), np.uint8))
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        boxes = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if abs(w - expected_w) <= expected_w * 0.25 and abs(h - expected_h) <= expected_h * 0.25:
+                boxes.append((x, y, w, h))
+        if len(boxes) < heroes_per_row:
+            print(f"Hero grid calibration found only {len(boxes)} portraits, keeping scaled defaults.")
+            return False
+
+        portrait_w = int(np.median([w for _, _, w, _ in boxes]))
+        portrait_h = int(np.median([h for _, _, _, h in boxes]))
+        columns = cluster_positions([x for x, _, _, _ in boxes], portrait_w / 2)
+        rows = cluster_positions([y for _, y, _, _ in boxes], portrait_h / 2)
+        if len(columns) < 2:
+            print("Hero grid calibration found a single column, keeping scaled defaults.")
+            return False
+
+        gap = int(np.median(np.diff(columns))) - portrait_w
+        self.hero_portrait_size = (portrait_w, portrait_h)
+        self.hero_gap = max(1, gap)
+        # The grid start is the left edge and the bottom edge of the first row
+        self.hero_grid_start = (columns[0], rows[0] + portrait_h)
+        print(f"Calibrated hero grid: start {self.hero_grid_start}, portrait {self.hero_portrait_size}, gap {self.hero_gap}")
+        return True
@@ -13,6 +13,10 @@ import numpy as np
 import pyautogui
 import pynput.keyboard as keyboard
 from .tooltip_detector import TooltipDetector
+from .tooltip_ocr import TooltipOCR
+from .manifest import ExtractionManifest, image_hash, new_run_id
+from .bundle import build_bundle
+from .layout import ScreenLayout, load_profile
 
 
 def get_sort_name(name):
@@ -50,9 +54,11 @@ def fetch_hero_data():
 
 
 class ExtractionOptions:
-    def __init__(self, extract_abilities=True, extract_stats=False):
+    def __init__(self, extract_abilities=True, extract_stats=False, run_ocr=False, calibrate_grid=False):
         self.extract_abilities = extract_abilities
         self.extract_stats = extract_stats
+        self.run_ocr = run_ocr
+        self.calibrate_grid = calibrate_grid
 
 
 class CrossPlatformController:
@@ -177,7 +183,7 @@ class DeadlockLauncher:
 
 
 class HeroImageExtractor:
-    def __init__(self, websocket_callback=None, debug=False):
+    def __init__(self, websocket_callback=None, debug=False, layout_path=None):
         self.output_dir = Path("extracted_images")
         self.abilities_dir = self.output_dir / "abilities"
         self.stats_dir = self.output_dir / "stats"
@@ -188,16 +194,17 @@ class HeroImageExtractor:
         self.controller = CrossPlatformController(websocket_callback)
         self.websocket_callback = websocket_callback
         self.detector = TooltipDetector()
+        self.ocr: Optional[TooltipOCR] = None
+        self.run_id = new_run_id()
+        self.manifest = ExtractionManifest(self.output_dir / "manifest.sqlite")
         
         self.hero_data, self.api_success = fetch_hero_data()
         self.hero_ids = [hero["id"] for hero in self.hero_data]
 
-        self.ability_positions = [(1417, 983), (1517, 983), (1617, 983), (1717, 983)]
-        self.stat_positions = [(1900, 470), (1900, 520), (1900, 560)]
+        self.layout = ScreenLayout(pyautogui.size(), load_profile(layout_path))
+        self.ability_positions = self.layout.ability_positions
+        self.stat_positions = self.layout.stat_positions
         self.stat_names = ["weapon", "vitality", "spirit"]
-        self.hero_grid_start = (104, 305)
-        self.hero_portrait_size = (75, 125)
-        self.hero_gap = 8
         self.heroes_per_row = 7
 
     async def send_status(self, message):
@@ -213,7 +220,7 @@ class HeroImageExtractor:
             await self.websocket_callback({"type": "stat_update", "hero_id": hero_id, "stat_index": stat_index, "filename": filename})
 
     def is_settings_menu_open(self):
-        pixel = pyautogui.pixel(162, 917)
+        pixel = pyautogui.pixel(*self.layout.settings_menu_pixel)
         return pixel[0] > 100
 
     async def navigate_to_hero_selection(self):
@@ -234,16 +241,28 @@ class HeroImageExtractor:
             await self.send_status("Failed to open settings menu.")
             return False
         
-        self.controller.click(273, 767)
+        self.controller.click(*self.layout.hero_selection_button)
         await asyncio.sleep(2)
         return True
 
+    async def calibrate_hero_grid(self):
+        await self.send_status("Calibrating hero grid from screenshot...")
+        frame = np.array(pyautogui.screenshot())
+        if self.layout.calibrate_hero_grid(frame, self.heroes_per_row):
+            await self.send_status(f"Hero grid calibrated at {self.layout.hero_grid_start}")
+        else:
+            await self.send_status("Hero grid calibration failed, using scaled layout")
+
     def get_hero_position(self, hero_index):
-        row = hero_index // self.heroes_per_row
-        col = hero_index % self.heroes_per_row
-        x = self.hero_grid_start[0] + col * (self.hero_portrait_size[0] + self.hero_gap) + self.hero_portrait_size[0] // 2
-        y = self.hero_grid_start[1] + row * (self.hero_portrait_size[1] + self.hero_gap) - self.hero_portrait_size[1] // 2
-        return (x, y)
+        return self.layout.hero_position(hero_index, self.heroes_per_row)
+
+    def record_capture(self, result, path, hero_index, kind, slot, slot_index):
+        file_hash = image_hash(path)
+        self.manifest.record(
+            self.run_id, self.hero_ids[hero_index], self.hero_data[hero_index]["name"], kind, slot, slot_index,
+            path, result["region"], result.get("confidence"), file_hash, result.get("latency"),
+        )
+        return file_hash
 
     async def capture_ability_tooltip(self, hero_index, ability_index):
         hero_id = self.hero_ids[hero_index]
@@ -256,6 +275,9 @@ class HeroImageExtractor:
             filename = f"hero{hero_id}_ability_{ability_index + 1}.png"
             result["image"].save(self.abilities_dir / filename)
             await self.send_status(f"Saved {filename}")
+            file_hash = self.record_capture(result, self.abilities_dir / filename, hero_index, "ability", f"ability_{ability_index + 1}", ability_index)
+            if self.ocr:
+                self.ocr.submit(self.abilities_dir / filename, hero_id, hero_name, f"ability_{ability_index + 1}", file_hash)
             await self.send_image_update(hero_id, ability_index + 1, filename)
         else:
             await self.send_status(f"Failed to detect tooltip for {hero_name} ability {ability_index + 1}")
@@ -273,6 +295,9 @@ class HeroImageExtractor:
             filename = f"hero{hero_id}_{stat_name}_stat.png"
             result["image"].save(self.stats_dir / filename)
             await self.send_status(f"Saved {filename}")
+            file_hash = self.record_capture(result, self.stats_dir / filename, hero_index, "stat", f"{stat_name}_stat", stat_index)
+            if self.ocr:
+                self.ocr.submit(self.stats_dir / filename, hero_id, hero_name, f"{stat_name}_stat", file_hash)
             await self.send_stat_update(hero_id, stat_index, filename)
         else:
             await self.send_status(f"Failed to detect tooltip for {hero_name} {stat_name} stat")
@@ -300,12 +325,42 @@ class HeroImageExtractor:
         await self.send_status("Extraction loop completed!")
         return True
 
+    def start_ocr(self):
+        ocr = TooltipOCR(self.output_dir)
+        if not ocr.available:
+            print("WARNING: pytesseract or the tesseract binary is not installed, skipping OCR stage.")
+            print("Install the 'ocr' extra and the tesseract binary to enable it.")
+            return
+        self.ocr = ocr
+
+    async def finish_ocr(self):
+        if not self.ocr: return
+        await self.send_status("Waiting for OCR workers to finish...")
+        rows = await asyncio.to_thread(self.ocr.finish)
+        if rows:
+            await self.send_status(f"Wrote OCR results for {len(rows)} tooltips to {self.ocr.results_path}")
+        self.ocr = None
+
+    async def pack_bundle(self):
+        index = await asyncio.to_thread(build_bundle, self.output_dir)
+        if index:
+            await self.send_status(f"Packed {len(index['entries'])} tooltips into {index['bundle']}")
+
     async def extract_hero_data(self, options: ExtractionOptions):
-        if not await self.navigate_to_hero_selection(): return False
-        return await self.run_extraction_loop(options)
+        if options.run_ocr:
+            self.start_ocr()
+        try:
+            if not await self.navigate_to_hero_selection(): return False
+            if options.calibrate_grid:
+                await self.calibrate_hero_grid()
+            return await self.run_extraction_loop(options)
+        finally:
+            await self.finish_ocr()
+            await self.pack_bundle()
 
     def cleanup(self):
         self.controller.cleanup()
+        self.manifest.close()
 
 
 def get_default_game_path():
@@ -330,15 +385,18 @@ async def main_cli():
     parser.add_argument('--abilities', action='store_true', help='Extract hero abilities')
     parser.add_argument('--stats', action='store_true', help='Extract hero stats')
     parser.add_argument('--game-path', type=str, help='Path to game executable')
+    parser.add_argument('--ocr', action='store_true', help='OCR captured tooltips into structured stat data')
+    parser.add_argument('--layout', type=str, help='Path to a JSON layout profile overriding the hover targets')
+    parser.add_argument('--calibrate-grid', action='store_true', help='Detect the hero grid from a screenshot')
     args = parser.parse_args()
     
     extract_abilities = args.abilities or not (args.abilities or args.stats)
-    options = ExtractionOptions(extract_abilities, args.stats)
+    options = ExtractionOptions(extract_abilities, args.stats, args.ocr, args.calibrate_grid)
     
     game_path = args.game_path or get_default_game_path()
     
     launcher = DeadlockLauncher(game_path)
-    extractor = HeroImageExtractor()
+    extractor = HeroImageExtractor(layout_path=args.layout)
     
     try:
         if await launcher.launch_game():
@@ -0,0 +1,150 @@
+import argparse
+import hashlib
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    hero_id INTEGER NOT NULL,
+    hero_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    slot_index INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    bbox_x INTEGER,
+    bbox_y INTEGER,
+    bbox_w INTEGER,
+    bbox_h INTEGER,
+    confidence REAL,
+    hash TEXT NOT NULL,
+    latency_ms REAL,
+    captured_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_captures_run ON captures (run_id);
+CREATE INDEX IF NOT EXISTS idx_captures_slot ON captures (hero_id, slot, id);
+"""
+
+COLUMNS = [
+    "run_id", "hero_id", "hero_name", "kind", "slot", "slot_index", "file_path",
+    "bbox_x", "bbox_y", "bbox_w", "bbox_h", "confidence", "hash", "latency_ms", "captured_at",
+]
+
+
+def image_hash(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+class ExtractionManifest:
+    """Append-only SQLite record of every capture, shared by all runs.
+
+    File paths are stored relative to the manifest's directory so a run folder
+    can be copied or archived together with its manifest. ``slot_index`` is
+    0-based for both abilities and stats. Readers should pass
+    ``read_only=True`` so a mistyped path is an error rather than a new,
+    empty database.
+    """
+
+    def __init__(self, path: Path, read_only: bool = False):
+        self.path = Path(path)
+        self.root = self.path.parent
+        if read_only:
+            if not self.path.is_file():
+                raise FileNotFoundError(f"Manifest not found: {self.path}")
+            self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        if read_only:
+            try:
+                self.conn.execute("SELECT 1 FROM captures LIMIT 1")
+            except sqlite3.DatabaseError:
+                self.conn.close()
+                raise ValueError(f"Not an extraction manifest: {self.path}")
+        else:
+            self.conn.executescript(SCHEMA)
+
+    def record(self, run_id: str, hero_id: int, hero_name: str, kind: str, slot: str, slot_index: int,
+               file_path: Path, region: Optional[Tuple[int, int, int, int]], confidence: Optional[float],
+               file_hash: str, latency: Optional[float]):
+        bbox = tuple(int(v) for v in region) if region else (None, None, None, None)
+        values = (
+            run_id, hero_id, hero_name, kind, slot, slot_index,
+            Path(file_path).relative_to(self.root).as_posix(), *bbox,
+            confidence, file_hash, latency * 1000 if latency is not None else None, time.time(),
+        )
+        with self.conn:
+            self.conn.execute(
+                f"INSERT INTO captures ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                values,
+            )
+
+    def runs(self) -> List[dict]:
+        rows = self.conn.execute(
+            "SELECT run_id, COUNT(*) AS captures, MIN(captured_at) AS started_at, MAX(captured_at) AS finished_at "
+            "FROM captures GROUP BY run_id ORDER BY started_at"
+        )
+        return [dict(row) for row in rows]
+
+    def latest_run_id(self) -> Optional[str]:
+        row = self.conn.execute("SELECT run_id FROM captures ORDER BY id DESC LIMIT 1").fetchone()
+        return row["run_id"] if row else None
+
+    def run_captures(self, run_id: str) -> List[dict]:
+        rows = self.conn.execute("SELECT * FROM captures WHERE run_id = ? ORDER BY id", (run_id,))
+        return [dict(row) for row in rows]
+
+    def latest_captures(self) -> List[dict]:
+        # Most recent capture of every hero/slot across all runs
+        rows = self.conn.execute(
+            "SELECT * FROM captures WHERE id IN (SELECT MAX(id) FROM captures GROUP BY hero_id, slot)"
+        )
+        return [dict(row) for row in rows]
+
+    def export_parquet(self, output_path: Path, run_id: Optional[str] = None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if run_id:
+            rows = self.run_captures(run_id)
+        else:
+            rows = [dict(row) for row in self.conn.execute("SELECT * FROM captures ORDER BY id")]
+        pq.write_table(pa.Table.from_pylist(rows), output_path)
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the extraction manifest')
+    parser.add_argument('--manifest', type=str, default='extracted_images/manifest.sqlite', help='Path to manifest.sqlite')
+    parser.add_argument('--export-parquet', type=str, help='Write the captures to this Parquet file')
+    parser.add_argument('--run-id', type=str, help='Only export captures from this run')
+    args = parser.parse_args()
+
+    try:
+        manifest = ExtractionManifest(Path(args.manifest), read_only=True)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+    try:
+        if args.export_parquet:
+            manifest.export_parquet(Path(args.export_parquet), args.run_id)
+            print(f"Exported captures to {args.export_parquet}")
+            return
+        for run in manifest.runs():
+            print(f"{run['run_id']}: {run['captures']} captures")
+    finally:
+        manifest.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import json
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .manifest import ExtractionManifest, image_hash
+
+
+CAPTURE_PATTERN = re.compile(r"^hero(\d+)_(ability_\d+|\w+_stat)\.png$")
+CAPTURE_DIRS = ["abilities", "stats"]
+# Per-pixel SSIM below this is highlighted in the overlays
+OVERLAY_THRESHOLD = 0.9
+# A tooltip counts as changed once this many pixels fall below
+# OVERLAY_THRESHOLD, so a single edited number is caught even though it barely
+# moves the mean SSIM of the whole tooltip.
+MIN_CHANGED_PIXELS = 10
+
+
+def collect_captures(run_dir: Path) -> Dict[str, Path]:
+    captures = {}
+    for sub_dir in CAPTURE_DIRS:
+        directory = Path(run_dir) / sub_dir
+        if not directory.is_dir():
+            continue
+        for path in directory.glob("hero*.png"):
+            if CAPTURE_PATTERN.match(path.name):
+                captures[f"{sub_dir}/{path.name}"] = path
+    return captures
+
+
+def load_run(run_path: Path) -> Tuple[Dict[str, Path], Dict[str, str]]:
+    run_path = Path(run_path)
+    if run_path.is_dir():
+        return collect_captures(run_path), {}
+
+    # A manifest file: use the latest capture of every hero and slot, so slots
+    # skipped by a partial run keep their earlier capture instead of showing
+    # up as removed, plus the hashes recorded at capture time.
+    if not run_path.exists():
+        raise FileNotFoundError(f"Run directory or manifest not found: {run_path}")
+    manifest = ExtractionManifest(run_path, read_only=True)
+    try:
+        rows = manifest.latest_captures()
+    finally:
+        manifest.close()
+    captures = {row["file_path"]: manifest.root / row["file_path"] for row in rows}
+    hashes = {row["file_path"]: row["hash"] for row in rows}
+    return captures, hashes
+
+
+def describe_capture(key: str) -> dict:
+    match = CAPTURE_PATTERN.match(Path(key).name)
+    return {"key": key, "hero_id": int(match.group(1)), "slot": match.group(2)}
+
+
+def load_gray(path: Path) -> np.ndarray:
+    with Image.open(path) as image:
+        return np.asarray(image.convert("L"), dtype=np.float32)
+
+
+def ssim_map(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    blur = lambda img: cv2.GaussianBlur(img, (11, 11), 1.5)
+
+    mu_a, mu_b = blur(a), blur(b)
+    mu_a_sq, mu_b_sq, mu_ab = mu_a * mu_a, mu_b * mu_b, mu_a * mu_b
+    sigma_a_sq = blur(a * a) - mu_a_sq
+    sigma_b_sq = blur(b * b) - mu_b_sq
+    sigma_ab = blur(a * b) - mu_ab
+
+    numerator = (2 * mu_ab + c1) * (2 * sigma_ab + c2)
+    denominator = (mu_a_sq + mu_b_sq + c1) * (sigma_a_sq + sigma_b_sq + c2)
+    return numerator / denominator
+
+
+def write_overlay(new_path: Path, mask: Optional[np.ndarray], overlay_path: Path):
+    with Image.open(new_path) as image:
+        overlay = np.array(image.convert("RGB"))
+    if mask is None:
+        # Size changed, so the whole tooltip is highlighted
+        cv2.rectangle(overlay, (0, 0), (overlay.shape[1] - 1, overlay.shape[0] - 1), (255, 0, 0), 3)
+    else:
+        mask = cv2.dilate(mask, np.ones((5, 5), np.uint8), iterations=2)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            cv2.rectangle(overlay, (x, y), (x + w, y + h), (255, 0, 0), 2)
+    overlay_path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(overlay).save(overlay_path)
+
+
+def compare_capture(old_path: Path, new_path: Path, overlay_path: Path, threshold: float) -> Optional[dict]:
+    old_gray, new_gray = load_gray(old_path), load_gray(new_path)
+    if old_gray.shape != new_gray.shape:
+        write_overlay(new_path, None, overlay_path)
+        return {"ssim": 0.0, "min_ssim": 0.0, "changed_pixels": int(new_gray.size), "size_changed": True}
+
+    similarity = ssim_map(old_gray, new_gray)
+    score = float(similarity.mean())
+    changed_pixels = int((similarity < OVERLAY_THRESHOLD).sum())
+    if score >= threshold and changed_pixels < MIN_CHANGED_PIXELS:
+        return None
+    mask = ((similarity < OVERLAY_THRESHOLD) * 255).astype(np.uint8)
+    write_overlay(new_path, mask, overlay_path)
+    return {
+        "ssim": round(score, 4),
+        "min_ssim": round(float(similarity.min()), 4),
+        "changed_pixels": changed_pixels,
+        "size_changed": False,
+    }
+
+
+def diff_runs(old_dir: Path, new_dir: Path, report_dir: Path, max_workers: int = 4, threshold: float = 0.98) -> dict:
+    start_time = time.time()
+    report_dir = Path(report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    # Overlays from an earlier diff would otherwise linger next to this report
+    shutil.rmtree(report_dir / "overlays", ignore_errors=True)
+
+    old_captures, old_hashes = load_run(old_dir)
+    new_captures, new_hashes = load_run(new_dir)
+    shared = sorted(old_captures.keys() & new_captures.keys())
+
+    def hashes_differ(key):
+        old_hash = old_hashes.get(key) or image_hash(old_captures[key])
+        new_hash = new_hashes.get(key) or image_hash(new_captures[key])
+        return old_hash != new_hash
+
+    def compare(key):
+        overlay_path = report_dir / "overlays" / key
+        result = compare_capture(old_captures[key], new_captures[key], overlay_path, threshold)
+        if result is None:
+            return None
+        return dict(describe_capture(key), overlay=str(overlay_path), **result)
+
+    # Workers load their own images, so memory stays bounded by max_workers
+    # regardless of the roster size.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        candidates = [key for key, differs in zip(shared, executor.map(hashes_differ, shared)) if differs]
+        changed = [result for result in executor.map(compare, candidates) if result]
+
+    report = {
+        "old": str(old_dir),
+        "new": str(new_dir),
+        "compared": len(shared),
+        "hash_mismatches": len(candidates),
+        "changed": changed,
+        "added": [describe_capture(key) for key in sorted(new_captures.keys() - old_captures.keys())],
+        "removed": [describe_capture(key) for key in sorted(old_captures.keys() - new_captures.keys())],
+        "changed_heroes": sorted({entry["hero_id"] for entry in changed}),
+        "elapsed": round(time.time() - start_time, 2),
+    }
+    (report_dir / "diff_report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two extraction runs and report changed tooltips')
+    parser.add_argument('old', type=str, help='Directory or manifest.sqlite of the previous extraction run')
+    parser.add_argument('new', type=str, help='Directory or manifest.sqlite of the new extraction run')
+    parser.add_argument('--output', type=str, default='patch_diff', help='Directory for the report and overlays')
+    parser.add_argument('--workers', type=int, default=4, help='Number of parallel comparison workers')
+    parser.add_argument('--threshold', type=float, default=0.98, help='Mean SSIM below which a tooltip counts as changed, even without a local change')
+    args = parser.parse_args()
+
+    try:
+        report = diff_runs(Path(args.old), Path(args.new), Path(args.output), args.workers, args.threshold)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+    print(f"Compared {report['compared']} tooltips in {report['elapsed']}s")
+    print(f"Changed: {len(report['changed'])}, added: {len(report['added'])}, removed: {len(report['removed'])}")
+    for entry in report["changed"]:
+        print(f"  hero {entry['hero_id']} {entry['slot']} (ssim {entry['ssim']}, min {entry['min_ssim']})")
+    print(f"Report written to {Path(args.output) / 'diff_report.json'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,9 +14,52 @@ class ExtractionDashboard {
     this.extractAbilitiesCheckbox =
       document.getElementById("extract-abilities");
     this.extractStatsCheckbox = document.getElementById("extract-stats");
+    this.runOcrCheckbox = document.getElementById("run-ocr");
+    this.calibrateGridCheckbox = document.getElementById("calibrate-grid");
 
     this.initializeWebSocket();
     this.bindEvents();
+    this.loadImagesFromBundle();
+  }
+
+  async loadImagesFromBundle() {
+    const images = this.heroGrid.querySelectorAll("img[data-src]");
+    if (images.length === 0) return;
+
+    try {
+      const indexResponse = await fetch("/api/bundle");
+      if (!indexResponse.ok) throw new Error("No bundle available");
+      const index = await indexResponse.json();
+
+      const bundleResponse = await fetch(index.url);
+      if (!bundleResponse.ok) throw new Error("Failed to fetch bundle");
+      const bundle = await bundleResponse.arrayBuffer();
+
+      images.forEach((img) => {
+        const key = img.dataset.src.replace(/^\/images\//, "");
+        const entry = index.entries[key];
+        // The bundle is only built at the end of an extraction, so it can be
+        // older than the page; use its bytes only for the capture shown here.
+        if (!entry || !img.dataset.hash || entry.hash !== img.dataset.hash) {
+          img.src = img.dataset.src;
+          return;
+        }
+        const blob = new Blob(
+          [bundle.slice(entry.offset, entry.offset + entry.length)],
+          { type: "image/png" }
+        );
+        const url = URL.createObjectURL(blob);
+        const revoke = () => URL.revokeObjectURL(url);
+        img.addEventListener("load", revoke, { once: true });
+        img.addEventListener("error", revoke, { once: true });
+        img.src = url;
+      });
+    } catch (error) {
+      console.warn("Falling back to individual images:", error);
+      images.forEach((img) => {
+        img.src = img.dataset.src;
+      });
+    }
   }
 
   initializeWebSocket() {
@@ -77,6 +120,8 @@ class ExtractionDashboard {
         body: JSON.stringify({
           extract_abilities: extractAbilities,
           extract_stats: extractStats,
+          run_ocr: this.runOcrCheckbox.checked,
+          calibrate_grid: this.calibrateGridCheckbox.checked,
         }),
       });
 
@@ -122,6 +167,8 @@ class ExtractionDashboard {
       this.stopBtn.disabled = false;
       this.extractAbilitiesCheckbox.disabled = true;
       this.extractStatsCheckbox.disabled = true;
+      this.runOcrCheckbox.disabled = true;
+      this.calibrateGridCheckbox.disabled = true;
     } else {
       this.statusIndicator.textContent = "Idle";
       this.statusIndicator.className = "status idle";
@@ -129,6 +176,8 @@ class ExtractionDashboard {
       this.stopBtn.disabled = true;
       this.extractAbilitiesCheckbox.disabled = false;
       this.extractStatsCheckbox.disabled = false;
+      this.runOcrCheckbox.disabled = false;
+      this.calibrateGridCheckbox.disabled = false;
     }
   }
 
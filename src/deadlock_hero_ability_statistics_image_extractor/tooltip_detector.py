@@ -13,6 +13,7 @@ class TooltipDetector:
         # The training script saves the best model in runs/detect/train/weights/best.pt
         self.model_path = Path("runs/detect/train/weights/best.pt")
         self.model = None
+        self.last_confidence: Optional[float] = None
         self.load_model()
         self.debug = debug
 
@@ -44,12 +45,14 @@ class TooltipDetector:
                 x1, y1, x2, y2 = coords
                 confidence = best_box.conf[0].cpu().numpy()
                 print(f"YOLO found tooltip with confidence {confidence:.2f}")
+                self.last_confidence = float(confidence)
                 return (x1, y1, x2 - x1, y2 - y1)
         
         return None
 
     async def wait_for_tooltip(self, timeout: float = 3.0) -> Optional[Tuple[int, int, int, int]]:
         start_time = time.time()
+        self.last_confidence = None
         
         while time.time() - start_time < timeout:
             # pyautogui.screenshot() returns a PIL Image in RGB format
@@ -68,6 +71,8 @@ class TooltipDetector:
         return None
 
     async def capture_tooltip(self, hover_position: Tuple[int, int], wait_time: float = 0.7) -> Optional[dict]:
+        start_time = time.time()
+        self.last_confidence = None
         pyautogui.moveTo(hover_position[0], hover_position[1])
         await asyncio.sleep(wait_time)
         
@@ -82,7 +87,9 @@ class TooltipDetector:
             return {
                 "image": tooltip_image,
                 "region": (x, y, w, h),
-                "hover_position": hover_position
+                "hover_position": hover_position,
+                "confidence": self.last_confidence,
+                "latency": time.time() - start_time
             }
             
         return None
@@ -0,0 +1,167 @@
+import json
+import re
+import subprocess
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from .manifest import image_hash
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+
+# Matches values such as "120", "-35%", "+0.8", "4.5s" or "12m"
+VALUE_PATTERN = re.compile(r"([+-]?\d+(?:\.\d+)?)\s*(%|s|m)?(?![\w.])")
+
+
+def parse_tooltip_text(text: str) -> Dict[str, dict]:
+    values = {}
+    for line in text.splitlines():
+        matches = list(VALUE_PATTERN.finditer(line))
+        if not matches:
+            continue
+        label = VALUE_PATTERN.sub("", line).strip(" :|-")
+        label = re.sub(r"\s+", " ", label)
+        if not label:
+            continue
+        number, unit = matches[0].groups()
+        # Tooltips can repeat a label (e.g. a base and a charged "Damage"), so
+        # later occurrences are numbered instead of overwriting the first.
+        key, count = label, 1
+        while key in values:
+            count += 1
+            key = f"{label} ({count})"
+        values[key] = {"value": float(number), "unit": unit or ""}
+    return values
+
+
+def tesseract_available() -> bool:
+    # pytesseract only wraps the tesseract binary, which has to be installed too
+    if pytesseract is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+    except (pytesseract.TesseractNotFoundError, subprocess.CalledProcessError):
+        return False
+    return True
+
+
+def run_ocr(image_path: Path) -> str:
+    with Image.open(image_path) as image:
+        # Tooltips are light text on a dark background; tesseract does better on
+        # an upscaled, inverted greyscale copy.
+        gray = image.convert("L")
+        gray = gray.resize((gray.width * 2, gray.height * 2), Image.LANCZOS)
+        gray = Image.eval(gray, lambda px: 255 - px)
+        return pytesseract.image_to_string(gray)
+
+
+def timed_run_ocr(image_path: Path) -> Tuple[str, float, float]:
+    start = time.perf_counter()
+    text = run_ocr(image_path)
+    return text, start, time.perf_counter()
+
+
+class TooltipOCR:
+    def __init__(self, output_dir: Path, max_workers: int = 4):
+        self.output_dir = Path(output_dir)
+        self.cache_path = self.output_dir / "ocr_cache.json"
+        self.results_path = self.output_dir / "ocr_results.json"
+        self.parquet_path = self.output_dir / "ocr_results.parquet"
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending: List[Tuple[dict, Future]] = []
+        self.rows: List[dict] = []
+        self.cache_hits = 0
+        self.cache = self.load_cache()
+        self.available = tesseract_available()
+
+    def load_cache(self) -> Dict[str, str]:
+        if self.cache_path.exists():
+            try:
+                return json.loads(self.cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable OCR cache: {e}")
+        return {}
+
+    def save_cache(self):
+        self.cache_path.write_text(json.dumps(self.cache), encoding="utf-8")
+
+    def submit(self, image_path: Path, hero_id: int, hero_name: str, slot: str, file_hash: Optional[str] = None):
+        if not self.available:
+            return
+
+        digest = file_hash or image_hash(image_path)
+        row = {
+            "hero_id": hero_id,
+            "hero_name": hero_name,
+            "slot": slot,
+            "image": str(image_path),
+            "hash": digest,
+        }
+        if digest in self.cache:
+            self.cache_hits += 1
+            self.add_row(row, self.cache[digest])
+            return
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.pending.append((row, self.executor.submit(timed_run_ocr, Path(image_path))))
+
+    def add_row(self, row: dict, text: str):
+        row["text"] = text
+        row["values"] = parse_tooltip_text(text)
+        self.rows.append(row)
+
+    def finish(self) -> List[dict]:
+        timings = []
+        for row, future in self.pending:
+            try:
+                text, start, end = future.result()
+            except Exception as e:
+                print(f"OCR failed for {row['image']}: {e}")
+                continue
+            timings.append((start, end))
+            self.cache[row["hash"]] = text
+            self.add_row(row, text)
+        self.pending = []
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        if not self.rows:
+            return []
+
+        self.save_cache()
+        self.write_results()
+        self.report_throughput(timings)
+        return self.rows
+
+    def report_throughput(self, timings: List[Tuple[float, float]]):
+        # Measured on the OCR work itself, from the first job starting to the
+        # last one finishing, so capture time during the run is not counted.
+        if timings:
+            wall = max(end for _, end in timings) - min(start for start, _ in timings)
+            busy = sum(end - start for start, end in timings)
+            rate = len(timings) / wall if wall > 0 else float(len(timings))
+            print(
+                f"OCR'd {len(timings)} tooltips in {wall:.1f}s with {self.max_workers} workers "
+                f"({rate:.1f}/s, {busy / len(timings):.2f}s per tooltip)"
+            )
+        print(f"Reused cached OCR for {self.cache_hits} unchanged tooltips")
+
+    def write_results(self):
+        self.results_path.write_text(json.dumps(self.rows, indent=2), encoding="utf-8")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            return
+        flat_rows = [dict(row, values=json.dumps(row["values"])) for row in self.rows]
+        pq.write_table(pa.Table.from_pylist(flat_rows), self.parquet_path)
@@ -7,12 +7,15 @@ from pathlib import Path
 from typing import Dict, List
 
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Form, HTTPException
+from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from .main import DeadlockLauncher, HeroImageExtractor, ExtractionOptions, get_default_game_path
+from .patch_diff import diff_runs
+from .manifest import ExtractionManifest
+from .bundle import bundle_dir, load_latest_index
 
 
 app = FastAPI()
@@ -21,6 +24,7 @@ package_dir = Path(__file__).parent
 static_dir = package_dir / "static"
 templates_dir = package_dir / "templates"
 images_dir = Path("extracted_images")
+manifest_path = images_dir / "manifest.sqlite"
 
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 app.mount("/images", StaticFiles(directory=str(images_dir)), name="images")
@@ -123,20 +127,43 @@ def fetch_hero_data_web():
 
 hero_data, api_success = fetch_hero_data_web()
 
-@app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
+def empty_extracted_images():
+    return {
+        hero["id"]: {"name": hero["name"], "abilities": {}, "stats": {}}
+        for hero in hero_data
+    }
+
+def manifest_extracted_images(extracted_images):
+    # Captures recorded in the manifest take precedence over the filename
+    # probe; rows whose file has since been deleted are skipped.
+    manifest = ExtractionManifest(manifest_path, read_only=True)
+    try:
+        captures = manifest.latest_captures()
+    finally:
+        manifest.close()
+
+    for capture in captures:
+        hero = extracted_images.get(capture["hero_id"])
+        if hero is None or not (images_dir / capture["file_path"]).exists():
+            continue
+        filename = Path(capture["file_path"]).name
+        entry = {"filename": filename, "path": f"/images/{capture['file_path']}", "hash": capture["hash"]}
+        # The dashboard numbers abilities from 1 and stats from 0
+        if capture["kind"] == "ability":
+            hero["abilities"][capture["slot_index"] + 1] = entry
+        else:
+            entry["name"] = capture["slot"][:-len("_stat")]
+            hero["stats"][capture["slot_index"]] = entry
+    return extracted_images
+
+def probe_extracted_images():
+    # Finds captures by filename, including those from before the manifest existed
     abilities_dir = images_dir / "abilities"
     stats_dir = images_dir / "stats"
-    extracted_images = {}
+    extracted_images = empty_extracted_images()
     
     for hero in hero_data:
         hero_id = hero["id"]
-        hero_name = hero["name"]
-        extracted_images[hero_id] = {
-            "name": hero_name,
-            "abilities": {},
-            "stats": {}
-        }
         
         for ability_index in range(1, 5):
             filename = f"hero{hero_id}_ability_{ability_index}.png"
@@ -159,6 +186,13 @@ async def dashboard(request: Request):
                     "path": f"/images/stats/{filename}",
                     "name": stat_name
                 }
+    return extracted_images
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard(request: Request):
+    extracted_images = probe_extracted_images()
+    if manifest_path.exists():
+        extracted_images = manifest_extracted_images(extracted_images)
     
     current_platform = platform.system()
     
@@ -182,6 +216,70 @@ async def get_hero_data():
         "platform": platform.system()
     }
 
+@app.get("/api/runs")
+async def get_runs():
+    if not manifest_path.exists():
+        return {"runs": []}
+    manifest = ExtractionManifest(manifest_path, read_only=True)
+    try:
+        return {"runs": manifest.runs()}
+    finally:
+        manifest.close()
+
+@app.get("/api/runs/{run_id}")
+async def get_run_captures(run_id: str):
+    if not manifest_path.exists():
+        raise HTTPException(status_code=404, detail="No extraction manifest found")
+    manifest = ExtractionManifest(manifest_path, read_only=True)
+    try:
+        captures = manifest.run_captures(run_id)
+    finally:
+        manifest.close()
+    if not captures:
+        raise HTTPException(status_code=404, detail=f"Unknown run: {run_id}")
+    return {"run_id": run_id, "captures": captures}
+
+@app.get("/api/bundle")
+async def get_bundle_index():
+    # Bundles are only built at the end of an extraction (pack_bundle)
+    index = load_latest_index(images_dir)
+    if index is None:
+        raise HTTPException(status_code=404, detail="No tooltip bundle has been built yet")
+    return dict(index, url=f"/bundles/{index['bundle']}")
+
+@app.get("/bundles/{bundle_name}")
+async def get_bundle(bundle_name: str):
+    bundle_path = bundle_dir(images_dir) / bundle_name
+    if Path(bundle_name).name != bundle_name or bundle_path.suffix != ".tar" or not bundle_path.exists():
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    # Bundle names are content hashes, so a given URL never changes.
+    # FileResponse answers Range requests for single entries.
+    return FileResponse(
+        bundle_path,
+        media_type="application/x-tar",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+@app.get("/api/diff")
+async def get_patch_diff(old: str, new: str = str(images_dir)):
+    old_dir, new_dir = Path(old), Path(new)
+    for run_dir in (old_dir, new_dir):
+        if not run_dir.exists():
+            raise HTTPException(status_code=404, detail=f"Run directory or manifest not found: {run_dir}")
+
+    report_dir = images_dir / "diffs"
+    try:
+        report = await asyncio.to_thread(diff_runs, old_dir, new_dir, report_dir)
+    except FileNotFoundError as e:
+        # Captures listed in a manifest may have been deleted since
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    for entry in report["changed"]:
+        overlay = Path(entry["overlay"]).relative_to(images_dir).as_posix()
+        entry["overlay_url"] = f"/images/{overlay}"
+    return report
+
 @app.get("/settings", response_class=HTMLResponse)
 async def settings_page(request: Request):
     current_platform = platform.system()
@@ -221,8 +319,10 @@ async def start_extraction(request: Request):
     body = await request.json()
     extract_abilities = body.get("extract_abilities", True)
     extract_stats = body.get("extract_stats", False)
+    run_ocr = body.get("run_ocr", False)
+    calibrate_grid = body.get("calibrate_grid", False)
     
-    options = ExtractionOptions(extract_abilities, extract_stats)
+    options = ExtractionOptions(extract_abilities, extract_stats, run_ocr, calibrate_grid)
     
     extraction_state["running"] = True
     
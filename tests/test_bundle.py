@@ -0,0 +1,70 @@
+import tarfile
+
+import numpy as np
+from PIL import Image
+
+from deadlock_hero_ability_statistics_image_extractor.bundle import bundle_dir, build_bundle, load_latest_index
+from deadlock_hero_ability_statistics_image_extractor.manifest import ExtractionManifest, image_hash
+
+
+def save_noise(path, size, seed):
+    # Noise barely compresses, so the PNGs end up with varied, unaligned sizes
+    rng = np.random.default_rng(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), np.uint8)).save(path)
+
+
+def make_captures(output_dir):
+    paths = []
+    for seed, (hero_id, slot) in enumerate([(1, "ability_1"), (1, "ability_2"), (2, "ability_1")]):
+        path = output_dir / "abilities" / f"hero{hero_id}_{slot}.png"
+        save_noise(path, (40 + seed * 13, 30 + seed * 7), seed)
+        paths.append(path)
+    path = output_dir / "stats" / "hero1_weapon_stat.png"
+    save_noise(path, (25, 25), 99)
+    paths.append(path)
+    return paths
+
+
+def test_entries_slice_back_to_their_source_png(tmp_path):
+    paths = make_captures(tmp_path)
+
+    index = build_bundle(tmp_path)
+    data = (bundle_dir(tmp_path) / index["bundle"]).read_bytes()
+
+    assert len(index["entries"]) == len(paths)
+    assert index["size"] == len(data)
+    for path in paths:
+        entry = index["entries"][path.relative_to(tmp_path).as_posix()]
+        assert data[entry["offset"]:entry["offset"] + entry["length"]] == path.read_bytes()
+        assert entry["hash"] == image_hash(path)
+    with tarfile.open(bundle_dir(tmp_path) / index["bundle"]) as tar:
+        assert sorted(tar.getnames()) == sorted(index["entries"])
+    assert load_latest_index(tmp_path) == index
+
+
+def test_rebuild_replaces_stale_bundle(tmp_path):
+    paths = make_captures(tmp_path)
+    first = build_bundle(tmp_path)
+    assert build_bundle(tmp_path)["bundle"] == first["bundle"]
+
+    save_noise(paths[0], (50, 50), 7)
+    second = build_bundle(tmp_path)
+
+    assert second["bundle"] != first["bundle"]
+    assert sorted(path.name for path in bundle_dir(tmp_path).iterdir()) == sorted(
+        [second["bundle"], second["bundle"].replace(".tar", ".json"), "latest.json"]
+    )
+
+
+def test_files_missing_from_the_manifest_are_still_bundled(tmp_path):
+    paths = make_captures(tmp_path)
+    manifest = ExtractionManifest(tmp_path / "manifest.sqlite")
+    manifest.record("run-1", 1, "Hero 1", "ability", "ability_1", 0, paths[0], None, None, "recorded-hash", None)
+    manifest.close()
+
+    index = build_bundle(tmp_path)
+
+    assert len(index["entries"]) == len(paths)
+    assert index["entries"]["abilities/hero1_ability_1.png"]["hash"] == "recorded-hash"
+    assert index["entries"]["abilities/hero1_ability_2.png"]["hash"] == image_hash(paths[1])
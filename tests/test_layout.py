@@ -0,0 +1,134 @@
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from deadlock_hero_ability_statistics_image_extractor.layout import (
+    DEFAULT_PROFILE,
+    ScreenLayout,
+    load_profile,
+)
+
+
+RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440), (3440, 1440)]
+HERO_COUNT = 32
+HEROES_PER_ROW = 7
+
+
+def draw_hero_grid(screen_size, start, portrait_size, gap, hero_count=HERO_COUNT):
+    # Replays a hero selection screen: dark background with solid portraits
+    width, height = screen_size
+    frame = np.full((height, width, 3), 20, np.uint8)
+    rects = []
+    for index in range(hero_count):
+        row, col = divmod(index, HEROES_PER_ROW)
+        x = start[0] + col * (portrait_size[0] + gap)
+        y = start[1] - portrait_size[1] + row * (portrait_size[1] + gap)
+        cv2.rectangle(frame, (x, y), (x + portrait_size[0] - 1, y + portrait_size[1] - 1), (200, 180, 160), -1)
+        rects.append((x, y, portrait_size[0], portrait_size[1]))
+    return frame, rects
+
+
+def inside(point, rect):
+    x, y, w, h = rect
+    return x <= point[0] < x + w and y <= point[1] < y + h
+
+
+def test_reference_resolution_is_identity():
+    layout = ScreenLayout((1920, 1080))
+    anchors = DEFAULT_PROFILE["anchors"]
+    assert layout.ability_positions == [tuple(p) for p in anchors["ability_positions"]["points"]]
+    assert layout.stat_positions == [tuple(p) for p in anchors["stat_positions"]["points"]]
+    assert layout.hero_grid_start == (104, 305)
+    assert layout.settings_menu_pixel == (162, 917)
+    assert layout.hero_selection_button == (273, 767)
+    assert layout.hero_portrait_size == (75, 125)
+    assert layout.hero_gap == 8
+
+
+@pytest.mark.parametrize("screen_size", RESOLUTIONS)
+def test_anchors_are_pinned_to_their_edge(screen_size):
+    width, height = screen_size
+    layout = ScreenLayout(screen_size)
+    scale = height / 1080
+
+    for (x, y), (ref_x, ref_y) in zip(layout.stat_positions, DEFAULT_PROFILE["anchors"]["stat_positions"]["points"]):
+        assert width - x == pytest.approx((1920 - ref_x) * scale, abs=1)
+        assert y == pytest.approx(ref_y * scale, abs=1)
+    for (x, _), (ref_x, _) in zip(layout.ability_positions, DEFAULT_PROFILE["anchors"]["ability_positions"]["points"]):
+        assert width - x == pytest.approx((1920 - ref_x) * scale, abs=1)
+    assert layout.hero_grid_start[0] == pytest.approx(104 * scale, abs=1)
+    assert layout.settings_menu_pixel == pytest.approx((162 * scale, 917 * scale), abs=1)
+    assert layout.hero_selection_button == pytest.approx((273 * scale, 767 * scale), abs=1)
+
+
+def test_center_edge_keeps_offset_from_middle():
+    layout = ScreenLayout((3440, 1440))
+    assert layout.scale_point(960, 540, "center") == (1720, 720)
+    assert layout.scale_point(1060, 540, "center") == (1720 + round(100 * 1440 / 1080), 720)
+
+
+@pytest.mark.parametrize("screen_size", RESOLUTIONS)
+def test_hero_positions_hit_scaled_portraits(screen_size):
+    layout = ScreenLayout(screen_size)
+    _, rects = draw_hero_grid(screen_size, layout.hero_grid_start, layout.hero_portrait_size, layout.hero_gap)
+
+    for index, rect in enumerate(rects):
+        assert inside(layout.hero_position(index, HEROES_PER_ROW), rect)
+
+
+@pytest.mark.parametrize("screen_size", RESOLUTIONS)
+def test_calibration_recovers_shifted_grid(screen_size):
+    layout = ScreenLayout(screen_size)
+    scale = screen_size[1] / 1080
+    # The real grid sits a few pixels away from the scaled defaults
+    start = (round(110 * scale), round(312 * scale))
+    portrait_size = (round(77 * scale), round(128 * scale))
+    gap = round(6 * scale)
+    frame, rects = draw_hero_grid(screen_size, start, portrait_size, gap)
+
+    assert layout.calibrate_hero_grid(frame, HEROES_PER_ROW)
+    for index, rect in enumerate(rects):
+        assert inside(layout.hero_position(index, HEROES_PER_ROW), rect)
+
+
+def test_calibration_keeps_defaults_without_portraits():
+    layout = ScreenLayout((1920, 1080))
+    frame = np.full((1080, 1920, 3), 20, np.uint8)
+
+    assert not layout.calibrate_hero_grid(frame, HEROES_PER_ROW)
+    assert layout.hero_grid_start == (104, 305)
+    assert layout.hero_portrait_size == (75, 125)
+
+
+def test_partial_profile_keeps_defaults_in_their_own_space(tmp_path):
+    profile_path = tmp_path / "layout.json"
+    profile_path.write_text(json.dumps({
+        "reference_size": [2560, 1440],
+        "anchors": {"stat_positions": {"edge": "right", "points": [[2520, 600], [2520, 660], [2520, 720]]}},
+    }))
+
+    layout = ScreenLayout((2560, 1440), load_profile(profile_path))
+    default_layout = ScreenLayout((2560, 1440))
+
+    assert layout.stat_positions == [(2520, 600), (2520, 660), (2520, 720)]
+    assert layout.ability_positions == default_layout.ability_positions
+    assert layout.hero_grid_start == default_layout.hero_grid_start
+    assert layout.hero_portrait_size == default_layout.hero_portrait_size
+    assert layout.hero_gap == default_layout.hero_gap
+
+
+def test_partial_profile_scales_to_other_resolutions(tmp_path):
+    profile_path = tmp_path / "layout.json"
+    profile_path.write_text(json.dumps({
+        "reference_size": [2560, 1440],
+        "anchors": {"hero_grid_start": {"edge": "left", "points": [[160, 400]]}},
+        "sizes": {"hero_gap": 12},
+    }))
+
+    layout = ScreenLayout((1280, 720), load_profile(profile_path))
+
+    assert layout.hero_grid_start == (80, 200)
+    assert layout.hero_gap == 6
+    assert layout.ability_positions == ScreenLayout((1280, 720)).ability_positions
@@ -0,0 +1,53 @@
+import pytest
+
+from deadlock_hero_ability_statistics_image_extractor.manifest import ExtractionManifest
+from deadlock_hero_ability_statistics_image_extractor.patch_diff import load_run
+
+
+def record_capture(manifest, run_id, hero_id, slot, slot_index, file_hash):
+    kind = "stat" if slot.endswith("_stat") else "ability"
+    sub_dir = "stats" if kind == "stat" else "abilities"
+    path = manifest.root / sub_dir / f"hero{hero_id}_{slot}.png"
+    manifest.record(run_id, hero_id, f"Hero {hero_id}", kind, slot, slot_index, path,
+                    (10, 20, 300, 180), 0.93, file_hash, 0.25)
+
+
+def test_record_stores_relative_paths_and_latency(tmp_path):
+    manifest = ExtractionManifest(tmp_path / "manifest.sqlite")
+    record_capture(manifest, "run-1", 1, "ability_1", 0, "aaa")
+
+    [capture] = manifest.run_captures("run-1")
+    manifest.close()
+
+    assert capture["file_path"] == "abilities/hero1_ability_1.png"
+    assert (capture["bbox_x"], capture["bbox_y"], capture["bbox_w"], capture["bbox_h"]) == (10, 20, 300, 180)
+    assert capture["slot_index"] == 0
+    assert capture["latency_ms"] == pytest.approx(250)
+    assert capture["hash"] == "aaa"
+
+
+def test_latest_captures_keeps_slots_skipped_by_a_partial_run(tmp_path):
+    manifest = ExtractionManifest(tmp_path / "manifest.sqlite")
+    record_capture(manifest, "run-1", 1, "ability_1", 0, "old-ability")
+    record_capture(manifest, "run-1", 1, "weapon_stat", 0, "old-stat")
+    # The second run only captured stats
+    record_capture(manifest, "run-2", 1, "weapon_stat", 0, "new-stat")
+
+    latest = {capture["slot"]: (capture["run_id"], capture["hash"]) for capture in manifest.latest_captures()}
+    assert manifest.latest_run_id() == "run-2"
+    manifest.close()
+
+    assert latest == {"ability_1": ("run-1", "old-ability"), "weapon_stat": ("run-2", "new-stat")}
+    captures, hashes = load_run(tmp_path / "manifest.sqlite")
+    assert sorted(captures) == ["abilities/hero1_ability_1.png", "stats/hero1_weapon_stat.png"]
+    assert hashes["stats/hero1_weapon_stat.png"] == "new-stat"
+
+
+def test_read_only_rejects_missing_or_foreign_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ExtractionManifest(tmp_path / "missing.sqlite", read_only=True)
+    assert not (tmp_path / "missing.sqlite").exists()
+
+    (tmp_path / "notes.txt").write_text("not a database")
+    with pytest.raises(ValueError):
+        ExtractionManifest(tmp_path / "notes.txt", read_only=True)
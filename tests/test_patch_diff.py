@@ -0,0 +1,65 @@
+import json
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from deadlock_hero_ability_statistics_image_extractor.patch_diff import compare_capture, diff_runs
+
+
+def draw_tooltip(path, damage="120", cooldown="8s"):
+    # A tooltip-sized crop with a couple of text lines
+    image = np.full((180, 320, 3), 30, np.uint8)
+    cv2.putText(image, "Damage", (12, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 1, cv2.LINE_AA)
+    cv2.putText(image, damage, (200, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 1, cv2.LINE_AA)
+    cv2.putText(image, "Cooldown", (12, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 1, cv2.LINE_AA)
+    cv2.putText(image, cooldown, (200, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 1, cv2.LINE_AA)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(image).save(path)
+
+
+def test_single_number_change_is_detected(tmp_path):
+    draw_tooltip(tmp_path / "old.png", damage="120")
+    draw_tooltip(tmp_path / "new.png", damage="125")
+
+    result = compare_capture(tmp_path / "old.png", tmp_path / "new.png", tmp_path / "overlay.png", 0.98)
+
+    assert result is not None
+    assert result["ssim"] > 0.98
+    assert result["changed_pixels"] > 0
+    assert (tmp_path / "overlay.png").exists()
+
+
+def test_identical_pixels_are_not_reported(tmp_path):
+    draw_tooltip(tmp_path / "old.png")
+    draw_tooltip(tmp_path / "new.png")
+
+    assert compare_capture(tmp_path / "old.png", tmp_path / "new.png", tmp_path / "overlay.png", 0.98) is None
+    assert not (tmp_path / "overlay.png").exists()
+
+
+def test_diff_runs_reports_changed_added_and_removed(tmp_path):
+    old_dir, new_dir = tmp_path / "old", tmp_path / "new"
+    for run_dir in (old_dir, new_dir):
+        draw_tooltip(run_dir / "abilities" / "hero1_ability_1.png")
+        draw_tooltip(run_dir / "stats" / "hero1_weapon_stat.png")
+    draw_tooltip(old_dir / "abilities" / "hero1_ability_2.png", cooldown="8s")
+    draw_tooltip(new_dir / "abilities" / "hero1_ability_2.png", cooldown="6s")
+    draw_tooltip(old_dir / "abilities" / "hero2_ability_1.png")
+    draw_tooltip(new_dir / "abilities" / "hero3_ability_1.png")
+
+    stale_overlay = tmp_path / "report" / "overlays" / "abilities" / "hero2_ability_1.png"
+    stale_overlay.parent.mkdir(parents=True)
+    stale_overlay.write_bytes(b"")
+
+    report = diff_runs(old_dir, new_dir, tmp_path / "report", max_workers=2)
+
+    assert report["compared"] == 3
+    assert report["hash_mismatches"] == 1
+    assert [entry["key"] for entry in report["changed"]] == ["abilities/hero1_ability_2.png"]
+    assert report["changed_heroes"] == [1]
+    assert [entry["key"] for entry in report["added"]] == ["abilities/hero3_ability_1.png"]
+    assert [entry["key"] for entry in report["removed"]] == ["abilities/hero2_ability_1.png"]
+    assert (tmp_path / "report" / "overlays" / "abilities" / "hero1_ability_2.png").exists()
+    assert not stale_overlay.exists()
+    assert json.loads((tmp_path / "report" / "diff_report.json").read_text()) == report
@@ -0,0 +1,93 @@
+import json
+import types
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from deadlock_hero_ability_statistics_image_extractor import tooltip_ocr
+from deadlock_hero_ability_statistics_image_extractor.manifest import image_hash
+from deadlock_hero_ability_statistics_image_extractor.tooltip_ocr import TooltipOCR, parse_tooltip_text
+
+
+TOOLTIP_TEXT = "Damage: 120\nCooldown 8.5s\nBullet Resist -35%\nDamage 200\n\nApplies a slow\n"
+
+
+class TesseractNotFoundError(EnvironmentError):
+    pass
+
+
+@pytest.fixture
+def fake_tesseract(monkeypatch):
+    # Stands in for pytesseract and records every image it is asked to read
+    calls = []
+
+    def image_to_string(image):
+        calls.append(image.size)
+        return TOOLTIP_TEXT
+
+    module = types.SimpleNamespace(
+        TesseractNotFoundError=TesseractNotFoundError,
+        get_tesseract_version=lambda: "5.3.0",
+        image_to_string=image_to_string,
+    )
+    monkeypatch.setattr(tooltip_ocr, "pytesseract", module)
+    return module, calls
+
+
+def save_tooltip(path, shade=30):
+    Image.fromarray(np.full((40, 60, 3), shade, np.uint8)).save(path)
+
+
+def test_parse_tooltip_text_reads_values_and_units():
+    values = parse_tooltip_text(TOOLTIP_TEXT)
+
+    assert values["Damage"] == {"value": 120.0, "unit": ""}
+    assert values["Cooldown"] == {"value": 8.5, "unit": "s"}
+    assert values["Bullet Resist"] == {"value": -35.0, "unit": "%"}
+    assert "Applies a slow" not in values
+
+
+def test_parse_tooltip_text_numbers_repeated_labels():
+    values = parse_tooltip_text("Damage 120\nDamage 200\nDamage 300")
+
+    assert [(label, entry["value"]) for label, entry in values.items()] == [
+        ("Damage", 120.0), ("Damage (2)", 200.0), ("Damage (3)", 300.0),
+    ]
+
+
+def test_unavailable_without_tesseract_binary(tmp_path, fake_tesseract, monkeypatch):
+    module, _ = fake_tesseract
+
+    def missing_binary():
+        raise TesseractNotFoundError()
+
+    monkeypatch.setattr(module, "get_tesseract_version", missing_binary)
+    ocr = TooltipOCR(tmp_path)
+    ocr.submit(tmp_path / "missing.png", 1, "Infernus", "ability_1")
+
+    assert not ocr.available
+    assert ocr.finish() == []
+
+
+def test_submit_reuses_cached_text(tmp_path, fake_tesseract):
+    _, calls = fake_tesseract
+    cached_path, new_path = tmp_path / "hero1_ability_1.png", tmp_path / "hero1_ability_2.png"
+    save_tooltip(cached_path, shade=30)
+    save_tooltip(new_path, shade=60)
+    (tmp_path / "ocr_cache.json").write_text(json.dumps({image_hash(cached_path): "Cooldown 12s"}))
+
+    ocr = TooltipOCR(tmp_path, max_workers=2)
+    ocr.submit(cached_path, 1, "Infernus", "ability_1")
+    ocr.submit(new_path, 1, "Infernus", "ability_2")
+    rows = ocr.finish()
+
+    assert ocr.cache_hits == 1
+    assert len(calls) == 1
+    assert {row["slot"]: row["values"] for row in rows} == {
+        "ability_1": {"Cooldown": {"value": 12.0, "unit": "s"}},
+        "ability_2": parse_tooltip_text(TOOLTIP_TEXT),
+    }
+    cache = json.loads((tmp_path / "ocr_cache.json").read_text())
+    assert cache[image_hash(new_path)] == TOOLTIP_TEXT
+    assert len(json.loads((tmp_path / "ocr_results.json").read_text())) == 2